@@ -1,7 +1,11 @@
+import asyncio
+import json
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+import backend.loader as loader
 from backend.loader import load_data
 from backend.utils.geometry import create_point
 from backend.utils.validators import validate_coordinates
@@ -14,9 +18,11 @@ from backend.services.pollution import analyze_pollution_risk
 from backend.services.minor_risks import (
     analyze_groundwater_risk,
     analyze_seismic_risk,
-    analyze_coastal_risk,
-    analyze_climate_context
+    analyze_coastal_risk
 )
+from backend.services.climate import analyze_climate_context
+from backend.services.validity import compute_validity_radius
+from backend.utils.result_cache import ValidityRadiusCache
 
 app = FastAPI(title="Kochi Environmental Risk Analyzer")
 
@@ -28,6 +34,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Results are reused for any point inside a cached result's validity radius
+analysis_cache = ValidityRadiusCache()
+infrastructure_cache = ValidityRadiusCache()
+stream_cache = ValidityRadiusCache()
+
 class LocationRequest(BaseModel):
     latitude: float
     longitude: float
@@ -36,6 +47,11 @@ class LocationRequest(BaseModel):
 async def startup_event():
     load_data()
 
+@app.get("/dataset-version")
+async def get_dataset_version():
+    # Clients key their result caches on this
+    return {"version": loader.dataset_version}
+
 @app.post("/analyze-location", response_model=AnalysisResponse, responses={400: {"model": ErrorResponse}})
 async def analyze_location(request: LocationRequest):
     lat = request.latitude
@@ -45,6 +61,14 @@ async def analyze_location(request: LocationRequest):
     if not validate_coordinates(lat, lon):
         raise HTTPException(status_code=400, detail="Invalid coordinates.")
 
+    cached = analysis_cache.get(lat, lon)
+    if cached:
+        response, radius = cached
+        return response.model_copy(update={
+            "location": response.location.model_copy(update={"latitude": lat, "longitude": lon}),
+            "validity_radius_m": radius
+        })
+
     point = create_point(lat, lon)
 
     # 2. Boundary Check
@@ -95,7 +119,7 @@ async def analyze_location(request: LocationRequest):
     # Collect Sources
     data_sources = [e.source for e in explanations]
 
-    return AnalysisResponse(
+    response = AnalysisResponse(
         location=LocationInfo(
             latitude=lat,
             longitude=lon,
@@ -103,8 +127,12 @@ async def analyze_location(request: LocationRequest):
         ),
         risk_tags=risk_tags,
         explanations=explanations,
-        data_sources=list(set(data_sources))
+        data_sources=list(set(data_sources)),
+        validity_radius_m=compute_validity_radius(point)
     )
+    analysis_cache.put(lat, lon, response.validity_radius_m, response)
+
+    return response
 
 from backend.services.infrastructure_context import analyze_infrastructure, assess_overall_constraints
 
@@ -114,6 +142,11 @@ async def get_infrastructure_context(lat: float, lon: float):
     if not validate_coordinates(lat, lon):
         raise HTTPException(status_code=400, detail="Invalid coordinates.")
         
+    cached = infrastructure_cache.get(lat, lon)
+    if cached:
+        result, radius = cached
+        return {**result, "validity_radius_m": radius}
+
     point = create_point(lat, lon)
     
     # 2. Get basic context
@@ -127,7 +160,153 @@ async def get_infrastructure_context(lat: float, lon: float):
     
     # Combine results
     # We return a flat dictionary with both parts
-    return {
+    result = {
         **infra_data,
-        "overall_assessment": assessment
+        "overall_assessment": assessment,
+        "validity_radius_m": compute_validity_radius(point)
     }
+    infrastructure_cache.put(lat, lon, result["validity_radius_m"], result)
+
+    return result
+
+# --- Streaming Analysis ---
+# Sections are emitted as NDJSON lines in the order they finish, so the UI can
+# paint the ward result immediately instead of waiting for the slowest analyzer.
+
+RISK_SECTIONS = {
+    "flood": analyze_flood_risk,
+    "pollution": analyze_pollution_risk,
+    "groundwater": analyze_groundwater_risk,
+    "seismic": analyze_seismic_risk,
+    "coastal": analyze_coastal_risk,
+    "climate": analyze_climate_context,
+}
+
+SECTION_ERROR_MESSAGE = "This check could not be completed."
+
+def section_message(section: str, data=None, error: str = None) -> dict:
+    if error is not None:
+        return {"section": section, "error": error}
+    return {"section": section, "data": data}
+
+def ndjson_line(message: dict) -> str:
+    return json.dumps(message) + "\n"
+
+async def run_section(name, func, *args):
+    # A failing analyzer becomes an error line instead of ending the stream
+    try:
+        result = await asyncio.to_thread(func, *args)
+    except Exception as e:
+        print(f"Error in {name} section: {e}")
+        return name, None, SECTION_ERROR_MESSAGE
+    return name, result, None
+
+async def analysis_sections(lat: float, lon: float):
+    point = create_point(lat, lon)
+
+    # 1. Boundary / Ward (cheapest check, always first)
+    _, boundary, error = await run_section("location", check_boundary_context, point)
+    if error:
+        yield section_message("error", ErrorResponse(
+            status="analysis_failed",
+            message="Location analysis could not be completed."
+        ).model_dump())
+        return
+    is_inside, ward_name = boundary
+
+    if not is_inside:
+        yield section_message("error", ErrorResponse(
+            status="out_of_service_area",
+            message="Location outside supported Kochi service area.",
+            supported_region_info="This tool covers Kochi Municipal Corporation and immediate Ernakulam environs."
+        ).model_dump())
+        _, radius, error = await run_section("validity", compute_validity_radius, point)
+        if error:
+            yield section_message("validity", error=error)
+        else:
+            yield section_message("validity", {"validity_radius_m": radius})
+        return
+
+    yield section_message("location", LocationInfo(latitude=lat, longitude=lon, ward=ward_name).model_dump())
+
+    # 2. Risk analyzers, infrastructure and the validity radius run concurrently, each streamed as it finishes
+    tasks = [asyncio.create_task(run_section(name, func, point)) for name, func in RISK_SECTIONS.items()]
+    tasks.append(asyncio.create_task(run_section("infrastructure", analyze_infrastructure, point, ward_name, is_inside)))
+    tasks.append(asyncio.create_task(run_section("validity", compute_validity_radius, point)))
+
+    tags_by_section = {}
+    infra_data = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            name, result, error = await next_done
+            if error:
+                yield section_message(name, error=error)
+                continue
+            if name == "infrastructure":
+                infra_data = result
+                yield section_message(name, infra_data)
+                continue
+            if name == "validity":
+                yield section_message(name, {"validity_radius_m": result})
+                continue
+
+            tags, explanations = result
+            tags_by_section[name] = tags
+            yield section_message(name, {
+                "risk_tags": [t.model_dump() for t in tags],
+                "explanations": [e.model_dump() for e in explanations]
+            })
+    finally:
+        # Client disconnected mid-stream
+        for task in tasks:
+            task.cancel()
+
+    # 3. Overall assessment reuses the sections computed above (a failed section is recomputed)
+    def overall_assessment():
+        infra = infra_data
+        if infra is None:
+            infra = analyze_infrastructure(point, ward_name, is_inside)
+        return assess_overall_constraints(
+            point,
+            infra,
+            f_tags=tags_by_section.get("flood"),
+            c_tags=tags_by_section.get("coastal"),
+            p_tags=tags_by_section.get("pollution")
+        )
+
+    _, assessment, error = await run_section("overall_assessment", overall_assessment)
+    if error:
+        yield section_message("overall_assessment", error=error)
+    else:
+        yield section_message("overall_assessment", assessment)
+
+async def stream_analysis(lat: float, lon: float):
+    # Replay a cached stream if the point is inside its validity radius
+    cached = stream_cache.get(lat, lon)
+    if cached:
+        messages, radius = cached
+        for message in messages:
+            if message["section"] == "location":
+                message = section_message("location", {**message["data"], "latitude": lat, "longitude": lon})
+            elif message["section"] == "validity":
+                message = section_message("validity", {"validity_radius_m": radius})
+            yield ndjson_line(message)
+        return
+
+    messages = []
+    async for message in analysis_sections(lat, lon):
+        messages.append(message)
+        yield ndjson_line(message)
+
+    # Only fully successful streams are reused
+    if any("error" in message for message in messages):
+        return
+    radius = next((m["data"]["validity_radius_m"] for m in messages if m["section"] == "validity"), 0.0)
+    stream_cache.put(lat, lon, radius, messages)
+
+@app.get("/analyze-location/stream")
+async def analyze_location_stream(lat: float, lon: float):
+    if not validate_coordinates(lat, lon):
+        raise HTTPException(status_code=400, detail="Invalid coordinates.")
+
+    return StreamingResponse(stream_analysis(lat, lon), media_type="application/x-ndjson")
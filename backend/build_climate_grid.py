@@ -0,0 +1,145 @@
+import os
+import json
+import hashlib
+import argparse
+import numpy as np
+
+# Paths
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data_store')
+CLIMATE_DIR = os.path.join(DATA_DIR, 'climate')
+
+GRID_FILE = 'imd_grid.npy'
+META_FILE = 'imd_grid.json'
+
+# Variable order along the last axis of the grid (cell x year x variable)
+VARIABLES = ["annual_rainfall_mm", "heavy_rain_days", "mean_tmax_c", "mean_tmin_c"]
+
+# IMD "heavy rain" threshold for a single day
+HEAVY_RAIN_MM = 64.5
+
+# IMD binary grid layouts (float32, day x lat x lon)
+RAIN_GRID = {"lat0": 6.5, "lon0": 66.5, "res": 0.25, "nlat": 129, "nlon": 135, "missing": -999.0}
+TEMP_GRID = {"lat0": 7.5, "lon0": 67.5, "res": 1.0, "nlat": 31, "nlon": 31, "missing": 99.9}
+
+# Default crop: Kochi and the surrounding Ernakulam district
+DEFAULT_BBOX = (9.5, 75.75, 10.5, 76.75)  # min_lat, min_lon, max_lat, max_lon
+
+
+def read_imd_binary(path, grid):
+    """
+    Reads an IMD daily binary file into a (day, lat, lon) float32 array.
+    """
+    raw = np.fromfile(path, dtype='<f4')
+    cells = grid["nlat"] * grid["nlon"]
+    return raw[: (raw.size // cells) * cells].reshape(-1, grid["nlat"], grid["nlon"])
+
+
+def crop_indices(grid, bbox):
+    """
+    Returns the lat/lon index ranges of the grid that fall inside the bbox.
+    """
+    min_lat, min_lon, max_lat, max_lon = bbox
+    lat_lo = int(np.ceil((min_lat - grid["lat0"]) / grid["res"]))
+    lat_hi = int(np.floor((max_lat - grid["lat0"]) / grid["res"])) + 1
+    lon_lo = int(np.ceil((min_lon - grid["lon0"]) / grid["res"]))
+    lon_hi = int(np.floor((max_lon - grid["lon0"]) / grid["res"])) + 1
+    return max(lat_lo, 0), min(lat_hi, grid["nlat"]), max(lon_lo, 0), min(lon_hi, grid["nlon"])
+
+
+def annual_rainfall(daily):
+    daily = np.where(daily <= RAIN_GRID["missing"] + 1, np.nan, daily)
+    total = np.nansum(daily, axis=0)
+    heavy = np.sum(daily >= HEAVY_RAIN_MM, axis=0).astype(np.float32)
+    # Sea / masked cells have no valid day at all: keep them missing, not 0 mm
+    masked = np.isnan(daily).all(axis=0)
+    total[masked] = np.nan
+    heavy[masked] = np.nan
+    return total, heavy
+
+
+def annual_mean_temp(daily):
+    daily = np.where(daily >= TEMP_GRID["missing"] - 0.05, np.nan, daily)
+    return np.nanmean(daily, axis=0)
+
+
+def write_climate_grid(grid, meta, out_dir=CLIMATE_DIR):
+    """
+    Writes the (cell, year, variable) array as .npy so it can be opened with mmap_mode='r'.
+    The metadata records a checksum of the array, so the backend can version the data
+    without reading the archive.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    grid = np.ascontiguousarray(grid, dtype=np.float32)
+    np.save(os.path.join(out_dir, GRID_FILE), grid)
+    meta = {**meta, "checksum": hashlib.sha256(grid.tobytes()).hexdigest()}
+    with open(os.path.join(out_dir, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Created {os.path.join(out_dir, GRID_FILE)} {grid.shape}")
+
+
+def build_from_imd(rain_dir, tmax_dir, tmin_dir, years, bbox=DEFAULT_BBOX,
+                   rain_pattern="ind{year}_rfp25.grd",
+                   tmax_pattern="Maxtemp_MaxT_{year}.GRD",
+                   tmin_pattern="Mintemp_MinT_{year}.GRD"):
+    """
+    Converts IMD daily gridded archives into the compact annual grid used by the climate service.
+    The output follows the 0.25 degree rainfall grid; temperature (1 degree) is mapped
+    onto it by nearest grid point.
+    """
+    lat_lo, lat_hi, lon_lo, lon_hi = crop_indices(RAIN_GRID, bbox)
+    nlat, nlon = lat_hi - lat_lo, lon_hi - lon_lo
+    if nlat <= 0 or nlon <= 0:
+        raise ValueError(f"Bounding box {bbox} does not overlap the IMD rainfall grid.")
+
+    # Nearest temperature cell for every rainfall cell in the crop
+    lats = RAIN_GRID["lat0"] + RAIN_GRID["res"] * np.arange(lat_lo, lat_hi)
+    lons = RAIN_GRID["lon0"] + RAIN_GRID["res"] * np.arange(lon_lo, lon_hi)
+    t_lat = np.clip(np.rint((lats - TEMP_GRID["lat0"]) / TEMP_GRID["res"]).astype(int), 0, TEMP_GRID["nlat"] - 1)
+    t_lon = np.clip(np.rint((lons - TEMP_GRID["lon0"]) / TEMP_GRID["res"]).astype(int), 0, TEMP_GRID["nlon"] - 1)
+
+    grid = np.full((nlat * nlon, len(years), len(VARIABLES)), np.nan, dtype=np.float32)
+
+    for y, year in enumerate(years):
+        rain = read_imd_binary(os.path.join(rain_dir, rain_pattern.format(year=year)), RAIN_GRID)
+        total, heavy = annual_rainfall(rain[:, lat_lo:lat_hi, lon_lo:lon_hi])
+        grid[:, y, 0] = total.ravel()
+        grid[:, y, 1] = heavy.ravel()
+
+        for v, (src_dir, pattern) in ((2, (tmax_dir, tmax_pattern)), (3, (tmin_dir, tmin_pattern))):
+            temp = read_imd_binary(os.path.join(src_dir, pattern.format(year=year)), TEMP_GRID)
+            mean = annual_mean_temp(temp)[np.ix_(t_lat, t_lon)]
+            grid[:, y, v] = mean.ravel()
+
+        print(f"Processed {year}")
+
+    meta = {
+        "lat0": float(lats[0]),
+        "lon0": float(lons[0]),
+        "res": RAIN_GRID["res"],
+        "nlat": nlat,
+        "nlon": nlon,
+        "years": list(years),
+        "variables": VARIABLES,
+        "source": "IMD Gridded Data"
+    }
+    return grid, meta
+
+
+def parse_years(value):
+    start, _, end = value.partition("-")
+    return list(range(int(start), int(end or start) + 1))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert IMD gridded archives into a memory-mappable climate grid.")
+    parser.add_argument("--rain-dir", required=True, help="Directory with IMD 0.25 degree daily rainfall .grd files")
+    parser.add_argument("--tmax-dir", required=True, help="Directory with IMD 1 degree daily max temperature .GRD files")
+    parser.add_argument("--tmin-dir", required=True, help="Directory with IMD 1 degree daily min temperature .GRD files")
+    parser.add_argument("--years", default="2014-2023", help="Year range, e.g. 2014-2023")
+    parser.add_argument("--bbox", nargs=4, type=float, default=DEFAULT_BBOX,
+                        metavar=("MIN_LAT", "MIN_LON", "MAX_LAT", "MAX_LON"))
+    parser.add_argument("--out-dir", default=CLIMATE_DIR)
+    args = parser.parse_args()
+
+    grid, meta = build_from_imd(args.rain_dir, args.tmax_dir, args.tmin_dir, parse_years(args.years), tuple(args.bbox))
+    write_climate_grid(grid, meta, args.out_dir)
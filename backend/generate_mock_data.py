@@ -1,7 +1,9 @@
 import os
 import json
+import numpy as np
 import geopandas as gpd
 from shapely.geometry import Polygon, LineString, Point
+from backend.build_climate_grid import CLIMATE_DIR, VARIABLES, write_climate_grid
 
 # Paths
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data_store')
@@ -71,5 +73,33 @@ def generate_data():
     coast_gdf = gpd.GeoDataFrame({'name': ['Coastline']}, geometry=[coast_line], crs="EPSG:4326")
     save_geojson(coast_gdf, os.path.join(HAZARDS_DIR, 'coastal_hazard_zones.geojson'))
 
+    # 8. Climate Grid (written with the same layout as build_climate_grid.py)
+    generate_climate_grid()
+
+def generate_climate_grid():
+    # 0.25 degree cells around Kochi, 2014-2023, cell x year x variable
+    lat0, lon0, res = 9.5, 75.75, 0.25
+    nlat, nlon = 5, 5
+    years = list(range(2014, 2024))
+
+    rng = np.random.default_rng(42)
+    t = np.arange(len(years))
+    cells = nlat * nlon
+    # Wetter towards the coast (west), mild upward trends in rain intensity and temperature
+    coast = np.repeat(np.linspace(1.1, 0.9, nlon)[None, :], nlat, axis=0).ravel()[:, None]
+
+    series = {
+        "annual_rainfall_mm": coast * (2900 + 15 * t) + rng.normal(0, 250, (cells, len(years))),
+        "heavy_rain_days": np.clip(coast * (7 + 0.3 * t) + rng.normal(0, 1.5, (cells, len(years))), 0, None).round(),
+        "mean_tmax_c": 31.2 + 0.05 * t + rng.normal(0, 0.2, (cells, len(years))),
+        "mean_tmin_c": 23.6 + 0.04 * t + rng.normal(0, 0.2, (cells, len(years))),
+    }
+    grid = np.stack([series[name] for name in VARIABLES], axis=-1)
+
+    write_climate_grid(grid, {
+        "lat0": lat0, "lon0": lon0, "res": res, "nlat": nlat, "nlon": nlon,
+        "years": years, "variables": VARIABLES, "source": "IMD Gridded Data"
+    }, CLIMATE_DIR)
+
 if __name__ == "__main__":
     generate_data()
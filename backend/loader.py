@@ -1,7 +1,11 @@
 import os
+import json
+import hashlib
+import numpy as np
 import geopandas as gpd
 import pandas as pd
 from shapely.geometry import Polygon
+from backend.utils.geometry import PROJECTED_EPSG
 
 # Data Store Paths
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data_store')
@@ -9,6 +13,10 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), 'data_store')
 BOUNDARIES_DIR = os.path.join(DATA_DIR, 'boundaries')
 CANALS_DIR = os.path.join(DATA_DIR, 'canals')
 HAZARDS_DIR = os.path.join(DATA_DIR, 'hazards')
+CLIMATE_DIR = os.path.join(DATA_DIR, 'climate')
+
+# Bump whenever analyzer output changes, so clients drop results cached by older code
+RESULTS_VERSION = 1
 
 # Global Data Cache
 kochi_boundary_gdf = None
@@ -19,6 +27,19 @@ industrial_zones_gdf = None
 groundwater_gdf = None
 coastal_gdf = None
 
+# Metre-based (UTM 43N) copies, projected once at load for distance checks
+kochi_boundary_proj = None
+ward_boundary_proj = None
+flood_zones_proj = None
+canals_proj = None
+industrial_zones_proj = None
+groundwater_proj = None
+coastal_proj = None
+
+climate_grid = None
+climate_meta = None
+dataset_version = None
+
 def load_geodataframe(path):
     """
     Helper to load a GeoJSON file. Returns an empty GDF if file not found.
@@ -37,9 +58,66 @@ def load_geodataframe(path):
         print(f"Error loading {path}: {e}")
         return gpd.GeoDataFrame(geometry=[], crs="EPSG:4326")
 
+def project_geodataframe(gdf):
+    """
+    Returns the GDF in the metre-based CRS used for distance calculations.
+    """
+    return gdf.to_crs(epsg=PROJECTED_EPSG)
+
+def load_climate_grid(directory):
+    """
+    Opens the gridded climate archive (cell x year x variable) as a read-only memory map.
+    Pages are shared through the OS cache, so workers do not hold a private copy in RAM.
+    Returns (None, None) if the archive is missing.
+    """
+    grid_path = os.path.join(directory, 'imd_grid.npy')
+    meta_path = os.path.join(directory, 'imd_grid.json')
+    if not os.path.exists(grid_path) or not os.path.exists(meta_path):
+        print(f"Warning: Climate grid not found at {directory}. Using static climate context.")
+        return None, None
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        grid = np.load(grid_path, mmap_mode='r')
+        if grid.shape != (meta['nlat'] * meta['nlon'], len(meta['years']), len(meta['variables'])):
+            raise ValueError(f"grid shape {grid.shape} does not match metadata")
+        return grid, meta
+    except Exception as e:
+        print(f"Error loading climate grid from {directory}: {e}")
+        return None, None
+
+def compute_dataset_version(directory):
+    """
+    Short content hash of the data store plus RESULTS_VERSION. Identical data gives the
+    same version on every replica, so clients can tell when their cached results are stale.
+    The climate archive is represented by its .npy header and size; its metadata JSON
+    carries a checksum of the array written by build_climate_grid.py.
+    """
+    digest = hashlib.sha256(f"results:{RESULTS_VERSION}\n".encode('utf-8'))
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            digest.update(os.path.relpath(path, directory).encode('utf-8'))
+            with open(path, 'rb') as f:
+                if name.endswith('.npy'):
+                    major, _ = np.lib.format.read_magic(f)
+                    if major == 1:
+                        header = np.lib.format.read_array_header_1_0(f)
+                    else:
+                        header = np.lib.format.read_array_header_2_0(f)
+                    digest.update(f"{header}:{os.path.getsize(path)}".encode('utf-8'))
+                else:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
 def load_data():
     global kochi_boundary_gdf, ward_boundary_gdf, flood_zones_gdf, canals_gdf
     global industrial_zones_gdf, groundwater_gdf, coastal_gdf
+    global kochi_boundary_proj, ward_boundary_proj, flood_zones_proj, canals_proj
+    global industrial_zones_proj, groundwater_proj, coastal_proj
+    global climate_grid, climate_meta, dataset_version
 
     print("Loading datasets...")
 
@@ -62,7 +140,21 @@ def load_data():
     # 6. Coastal
     coastal_gdf = load_geodataframe(os.path.join(HAZARDS_DIR, 'coastal_hazard_zones.geojson'))
 
-    print("Data loading complete.")
+    # Projected copies, so requests never reproject a layer
+    kochi_boundary_proj = project_geodataframe(kochi_boundary_gdf)
+    ward_boundary_proj = project_geodataframe(ward_boundary_gdf)
+    flood_zones_proj = project_geodataframe(flood_zones_gdf)
+    canals_proj = project_geodataframe(canals_gdf)
+    industrial_zones_proj = project_geodataframe(industrial_zones_gdf)
+    groundwater_proj = project_geodataframe(groundwater_gdf)
+    coastal_proj = project_geodataframe(coastal_gdf)
+
+    # 7. Climate (memory-mapped, not read into RAM)
+    climate_grid, climate_meta = load_climate_grid(CLIMATE_DIR)
+
+    dataset_version = compute_dataset_version(DATA_DIR)
+
+    print(f"Data loading complete (dataset version {dataset_version}).")
 
 # Trigger load on module import or explicit call
 # In a real app, you might want to call this explicitly in startup
@@ -24,6 +24,7 @@ class AnalysisResponse(BaseModel):
     risk_tags: List[RiskTag]
     explanations: List[Explanation]
     data_sources: List[str]
+    validity_radius_m: float = 0.0  # Result is identical anywhere within this radius
 
 class ErrorResponse(BaseModel):
     status: str
@@ -1,6 +1,7 @@
 from shapely.geometry import Point
 from shapely.geometry import Point
 import backend.loader as loader
+from backend.utils.geometry import distance_to_edges
 
 def check_boundary_context(point: Point):
     """
@@ -42,3 +43,12 @@ def check_boundary_context(point: Point):
                 ward_name = "Unknown Ward"
 
     return is_inside, ward_name
+
+def boundary_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres the point can move without changing service area or ward membership.
+    """
+    return min(
+        distance_to_edges(loader.kochi_boundary_proj, point_proj),
+        distance_to_edges(loader.ward_boundary_proj, point_proj)
+    )
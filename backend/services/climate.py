@@ -0,0 +1,133 @@
+import math
+from shapely.geometry import Point
+import numpy as np
+import backend.loader as loader
+from backend.models.response_models import Explanation
+
+TREND_WINDOW_YEARS = 10
+
+# Metres per degree (latitude uses the smallest, equatorial value)
+METERS_PER_DEG_LAT = 110574
+METERS_PER_DEG_LON_EQUATOR = 111320
+
+def lookup_climate_cell(lat: float, lon: float):
+    """
+    Returns the row of the climate grid nearest to the point, or None if outside the grid.
+    Pure index arithmetic on the regular lat/lon grid, no spatial search.
+    """
+    meta = loader.climate_meta
+    i = int(round((lat - meta['lat0']) / meta['res']))
+    j = int(round((lon - meta['lon0']) / meta['res']))
+    if not (0 <= i < meta['nlat'] and 0 <= j < meta['nlon']):
+        return None
+    return i * meta['nlon'] + j
+
+def compute_trends(series: np.ndarray, years: np.ndarray):
+    """
+    Least-squares slope per variable for a (year x variable) block.
+    Missing years (NaN) are ignored per variable.
+    Returns (mean, slope per year) arrays, one entry per variable.
+    """
+    valid = ~np.isnan(series)
+    n = valid.sum(axis=0)
+    x = np.where(valid, years[:, None], 0.0)
+    y = np.where(valid, series, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = x.sum(axis=0) / n
+        y_mean = y.sum(axis=0) / n
+        dx = np.where(valid, years[:, None] - x_mean, 0.0)
+        dy = np.where(valid, series - y_mean, 0.0)
+        slope = (dx * dy).sum(axis=0) / (dx * dx).sum(axis=0)
+
+    return y_mean, slope
+
+def static_climate_context():
+    return [], [
+        Explanation(
+            category="Climate Context",
+            text=["Decadal trend shows increasing rainfall intensity.", "Temp anomaly +0.6C observed."],
+            source="IMD Gridded Data",
+            year="2023"
+        )
+    ]
+
+def analyze_climate_context(point: Point):
+    if loader.climate_grid is None:
+        return static_climate_context()
+
+    cell = lookup_climate_cell(point.y, point.x)
+    if cell is None:
+        return static_climate_context()
+
+    meta = loader.climate_meta
+    years = np.asarray(meta['years'][-TREND_WINDOW_YEARS:], dtype=np.float64)
+    # Only this cell's last decade is paged in from the memory map
+    series = np.asarray(loader.climate_grid[cell, -len(years):, :], dtype=np.float64)
+    means, slopes = compute_trends(series, years)
+    stats = dict(zip(meta['variables'], zip(means, slopes)))
+
+    period = f"{int(years[0])}-{int(years[-1])}"
+    span = years[-1] - years[0]
+    text = []
+
+    if 'annual_rainfall_mm' in stats:
+        mean, slope = stats['annual_rainfall_mm']
+        if not np.isnan(mean):
+            trend = "" if np.isnan(slope) else f" ({slope * span:+,.0f} mm change over the period)"
+            text.append(f"Mean annual rainfall {period}: {mean:,.0f} mm{trend}.")
+    if 'heavy_rain_days' in stats:
+        mean, slope = stats['heavy_rain_days']
+        if not np.isnan(mean):
+            if np.isnan(slope):
+                trend = ""
+            else:
+                direction = "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
+                trend = f", {direction} ({slope * span:+.1f} days over the period)"
+            text.append(f"Heavy rainfall days (>= 64.5 mm): {mean:.1f} per year{trend}.")
+    if 'mean_tmax_c' in stats:
+        mean, slope = stats['mean_tmax_c']
+        if not np.isnan(mean):
+            trend = "" if np.isnan(slope) else f" (trend {slope * span:+.1f}C over the period)"
+            text.append(f"Mean daily maximum temperature {mean:.1f}C{trend}.")
+    if 'mean_tmin_c' in stats:
+        mean, slope = stats['mean_tmin_c']
+        if not np.isnan(mean):
+            trend = "" if np.isnan(slope) else f" (trend {slope * span:+.1f}C over the period)"
+            text.append(f"Mean daily minimum temperature {mean:.1f}C{trend}.")
+
+    if not text:
+        return static_climate_context()
+
+    return [], [
+        Explanation(
+            category="Climate Context",
+            text=text,
+            source=meta.get('source', "IMD Gridded Data"),
+            year=str(int(years[-1]))
+        )
+    ]
+
+def climate_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres the point can move while staying in the same climate grid cell
+    (or outside the grid, when it already is).
+    """
+    meta = loader.climate_meta
+    if loader.climate_grid is None:
+        return math.inf
+
+    lat, lon = point.y, point.x
+    fi = (lat - meta['lat0']) / meta['res']
+    fj = (lon - meta['lon0']) / meta['res']
+    m_lat = METERS_PER_DEG_LAT * meta['res']
+    m_lon = METERS_PER_DEG_LON_EQUATOR * math.cos(math.radians(lat)) * meta['res']
+
+    if lookup_climate_cell(lat, lon) is not None:
+        # Slack to the nearest cell edge
+        return min((0.5 - abs(fi - round(fi))) * m_lat, (0.5 - abs(fj - round(fj))) * m_lon)
+
+    # Distance to the grid extent
+    out_i = max(-0.5 - fi, fi - (meta['nlat'] - 0.5), 0.0)
+    out_j = max(-0.5 - fj, fj - (meta['nlon'] - 0.5), 0.0)
+    return math.hypot(out_i * m_lat, out_j * m_lon)
@@ -1,7 +1,8 @@
+import math
 from shapely.geometry import Point
-import geopandas as gpd
 import backend.loader as loader
 from backend.models.response_models import RiskTag, Explanation
+from backend.utils.geometry import project_point, distance_to_edges
 
 TP_CANAL_THRESHOLD_METERS = 300
 GENERAL_CANAL_THRESHOLD_METERS = 100
@@ -39,26 +40,11 @@ def analyze_flood_risk(point: Point):
     # 2. Canal Proximity
     if not loader.canals_gdf.empty:
         # Calculate distance to nearest canal
-        # Project to a local CRS (e.g. EPSG:32643 - UTM Zone 43N) for accurate distance in meters
-        # But for simplicity/speed without heavy dependencies, we might estimate or use a simple distance check if data is already projected.
-        # Ideally: point_proj = point in meters, gdf_proj = gdf in meters.
-        
-        # We will use a crude approximation if CRS is 4326: 1 deg ~ 111km. 
-        # Better: use project. 
-        # But let's assume we can do a quick check if global 'canals_gdf' is 4326.
-        # We should accept that distance() on 4326 returns degrees.
-        
-        # To be accurate:
-        # point_meters = gpd.GeoSeries([point], crs="EPSG:4326").to_crs("EPSG:32643").iloc[0]
-        # canals_meters = canals_gdf.to_crs("EPSG:32643")
-        # distances = canals_meters.distance(point_meters)
-        # min_dist = distances.min()
-        
+        # Canals are projected once at load (UTM Zone 43N) for accurate distance in meters
         try:
-            point_series = gpd.GeoSeries([point], crs="EPSG:4326").to_crs(epsg=32643)
-            canals_proj = loader.canals_gdf.to_crs(epsg=32643)
+            canals_proj = loader.canals_proj
             
-            distances = canals_proj.distance(point_series.iloc[0])
+            distances = canals_proj.distance(project_point(point))
             min_dist = distances.min()
             
             nearest_idx = distances.idxmin()
@@ -93,3 +79,31 @@ def analyze_flood_risk(point: Point):
             print(f"Error in canal distance calc: {e}")
 
     return tags, explanations
+
+def flood_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres the point can move without changing analyze_flood_risk's result.
+    Canal tags report the exact distance, so a tagged point has no slack.
+    """
+    radius = distance_to_edges(loader.flood_zones_proj, point_proj)
+
+    if not loader.canals_gdf.empty:
+        try:
+            canals_proj = loader.canals_proj
+            distances = canals_proj.distance(point_proj)
+
+            if 'name' in canals_proj.columns:
+                is_tp = canals_proj['name'].astype(str).str.contains("TP Canal", regex=False)
+            else:
+                is_tp = distances < 0
+            tp_dist = distances[is_tp].min() if is_tp.any() else math.inf
+            min_dist = distances.min()
+
+            if min_dist < GENERAL_CANAL_THRESHOLD_METERS or tp_dist < TP_CANAL_THRESHOLD_METERS:
+                return 0.0
+            radius = min(radius, min_dist - GENERAL_CANAL_THRESHOLD_METERS, tp_dist - TP_CANAL_THRESHOLD_METERS)
+        except Exception as e:
+            print(f"Error in canal validity calc: {e}")
+            return 0.0
+
+    return radius
@@ -78,25 +78,29 @@ def analyze_infrastructure(point: Point, ward_name: str, is_inside: bool):
         
     return context
 
-def assess_overall_constraints(point: Point, infra_context: dict):
+def assess_overall_constraints(point: Point, infra_context: dict, f_tags=None, c_tags=None, p_tags=None):
+    # Risk tags may be passed in when the caller has already run the analyzers
     reasons = []
     status = "normal_context"
     
     # 1. Flood Critical Zone
-    f_tags, _ = analyze_flood_risk(point)
+    if f_tags is None:
+        f_tags, _ = analyze_flood_risk(point)
     for tag in f_tags:
         if tag.category == "Flood" and tag.risk_level == "HIGH":
             reasons.append("Flood-prone zone / Critical Canal Proximity")
             
     # 2. Disaster Prone Zone
     # Coastal
-    c_tags, _ = analyze_coastal_risk(point)
+    if c_tags is None:
+        c_tags, _ = analyze_coastal_risk(point)
     for tag in c_tags:
         if tag.category == "Coastal" and tag.risk_level in ["MODERATE", "HIGH"]: 
              reasons.append("Coastal hazard influence zone")
              
     # Industrial
-    p_tags, _ = analyze_pollution_risk(point)
+    if p_tags is None:
+        p_tags, _ = analyze_pollution_risk(point)
     for tag in p_tags:
         if tag.category == "Industrial" and tag.risk_level == "HIGH":
              reasons.append("Industrial accident hazard influence zone")
@@ -1,7 +1,10 @@
+import math
 from shapely.geometry import Point
-import geopandas as gpd
 import backend.loader as loader
 from backend.models.response_models import RiskTag, Explanation
+from backend.utils.geometry import project_point, distance_to_edges
+
+COASTAL_ZONE_METERS = 500 # 500m coastal regulation zone approx
 
 # Groundwater
 def analyze_groundwater_risk(point: Point):
@@ -50,12 +53,10 @@ def analyze_coastal_risk(point: Point):
     if not loader.coastal_gdf.empty:
         # Simple distance check to coastline
         try:
-             # Reproject for meters
-            point_series = gpd.GeoSeries([point], crs="EPSG:4326").to_crs(epsg=32643)
-            coast_proj = loader.coastal_gdf.to_crs(epsg=32643)
-            dist = coast_proj.distance(point_series.iloc[0]).min()
+            # Coastline is projected once at load for meters
+            dist = loader.coastal_proj.distance(project_point(point)).min()
             
-            if dist < 500: # 500m coastal regulation zone approx
+            if dist < COASTAL_ZONE_METERS:
                  tags.append(RiskTag(category="Coastal", risk_level="MODERATE", description="Within Coastal Regulation Zone influence."))
                  explanations.append(Explanation(category="Coastal Hazard", text=[f"Distance to coast: {int(dist)}m"], source="KCZMA", year="2019"))
         except:
@@ -63,13 +64,23 @@ def analyze_coastal_risk(point: Point):
             
     return tags, explanations
 
-# Climate
-def analyze_climate_context(point: Point):
-    return [], [
-        Explanation(
-            category="Climate Context",
-            text=["Decadal trend shows increasing rainfall intensity.", "Temp anomaly +0.6C observed."],
-            source="IMD Gridded Data",
-            year="2023"
-        )
-    ]
+def groundwater_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres to the nearest groundwater block edge.
+    """
+    return distance_to_edges(loader.groundwater_proj, point_proj)
+
+def coastal_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres the point can move without changing analyze_coastal_risk's result.
+    """
+    if loader.coastal_gdf.empty:
+        return math.inf
+
+    try:
+        dist = loader.coastal_proj.distance(point_proj).min()
+    except Exception as e:
+        print(f"Error in coastal validity calc: {e}")
+        return 0.0
+
+    return max(dist - COASTAL_ZONE_METERS, 0.0)
@@ -1,7 +1,8 @@
+import math
 from shapely.geometry import Point
-import geopandas as gpd
 import backend.loader as loader
 from backend.models.response_models import RiskTag, Explanation
+from backend.utils.geometry import project_point
 
 INDUSTRIAL_BUFFER_METERS = 500
 
@@ -12,10 +13,9 @@ def analyze_pollution_risk(point: Point):
     # 1. Industrial Cluster Proximity
     if not loader.industrial_zones_gdf.empty:
         try:
-            point_series = gpd.GeoSeries([point], crs="EPSG:4326").to_crs(epsg=32643)
-            inds_proj = loader.industrial_zones_gdf.to_crs(epsg=32643)
+            inds_proj = loader.industrial_zones_proj
             
-            distances = inds_proj.distance(point_series.iloc[0])
+            distances = inds_proj.distance(project_point(point))
             min_dist = distances.min()
             
             if min_dist < INDUSTRIAL_BUFFER_METERS:
@@ -50,3 +50,19 @@ def analyze_pollution_risk(point: Point):
     ))
 
     return tags, explanations
+
+def pollution_validity_radius(point: Point, point_proj: Point) -> float:
+    """
+    Distance in metres the point can move without changing analyze_pollution_risk's result.
+    Inside the buffer the reported distance changes with any move.
+    """
+    if loader.industrial_zones_gdf.empty:
+        return math.inf
+
+    try:
+        min_dist = loader.industrial_zones_proj.distance(point_proj).min()
+    except Exception as e:
+        print(f"Error in pollution validity calc: {e}")
+        return 0.0
+
+    return max(min_dist - INDUSTRIAL_BUFFER_METERS, 0.0)
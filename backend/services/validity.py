@@ -0,0 +1,32 @@
+import math
+from shapely.geometry import Point
+from backend.utils.geometry import project_point
+from backend.services.boundary import boundary_validity_radius
+from backend.services.flood import flood_validity_radius
+from backend.services.pollution import pollution_validity_radius
+from backend.services.minor_risks import groundwater_validity_radius, coastal_validity_radius
+from backend.services.climate import climate_validity_radius
+
+# Cap for points far from every dataset feature
+MAX_VALIDITY_RADIUS_METERS = 5000
+# Shrink the radius slightly to absorb projection scale error
+VALIDITY_SAFETY_FACTOR = 0.99
+
+VALIDITY_CHECKS = [
+    boundary_validity_radius,
+    flood_validity_radius,
+    pollution_validity_radius,
+    groundwater_validity_radius,
+    coastal_validity_radius,
+    climate_validity_radius,
+]
+
+def compute_validity_radius(point: Point) -> float:
+    """
+    Radius in metres around the point within which every analysis result is identical.
+    It is the smallest slack across ward/hazard polygon edges and proximity thresholds.
+    Seismic context is static and does not constrain the radius.
+    """
+    point_proj = project_point(point)
+    radius = min([check(point, point_proj) for check in VALIDITY_CHECKS] + [MAX_VALIDITY_RADIUS_METERS])
+    return float(math.floor(max(radius, 0.0) * VALIDITY_SAFETY_FACTOR))
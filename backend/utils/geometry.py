@@ -1,7 +1,46 @@
+import math
+import geopandas as gpd
+from pyproj import Transformer
 from shapely.geometry import Point
 
+# UTM Zone 43N, used for all metre-based distances
+PROJECTED_EPSG = 32643
+EARTH_RADIUS_METERS = 6371008.8
+
+# Built once; creating a transformer per call dominates the cost of projecting a point
+TO_PROJECTED = Transformer.from_crs("EPSG:4326", f"EPSG:{PROJECTED_EPSG}", always_xy=True)
+
 def create_point(lat: float, lon: float) -> Point:
     """
     Creates a Shapely Point from latitude and longitude.
     """
     return Point(lon, lat)  # Shapely uses (x, y) -> (lon, lat)
+
+def project_point(point: Point) -> Point:
+    """
+    Projects a lon/lat point to the metre-based CRS.
+    """
+    return Point(*TO_PROJECTED.transform(point.x, point.y))
+
+def distance_to_edges(gdf_proj: gpd.GeoDataFrame, point_proj: Point) -> float:
+    """
+    Distance in metres from a projected point to the nearest polygon edge (or line)
+    in an already projected GDF. Returns infinity for an empty GDF.
+    """
+    if gdf_proj.empty:
+        return math.inf
+    geoms = gdf_proj.geometry
+    # Polygons are measured to their outline; lines already are edges
+    is_polygon = geoms.geom_type.isin(["Polygon", "MultiPolygon"])
+    edges = geoms.boundary.where(is_polygon, geoms)
+    return edges.distance(point_proj).min()
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in metres between two lat/lon points.
+    """
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
@@ -0,0 +1,32 @@
+from collections import OrderedDict
+from backend.utils.geometry import haversine_meters
+
+class ValidityRadiusCache:
+    """
+    LRU cache of analysis results keyed by location. A cached result is reused for any
+    point that lies within its validity radius.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, lat: float, lon: float):
+        """
+        Returns (payload, remaining_radius) for the first cached result covering the point, or None.
+        The remaining radius is still a valid guarantee around the new point.
+        """
+        for key, (radius, payload) in self.entries.items():
+            moved = haversine_meters(lat, lon, key[0], key[1])
+            if moved <= radius:
+                self.entries.move_to_end(key)
+                return payload, float(int(radius - moved))
+        return None
+
+    def put(self, lat: float, lon: float, radius: float, payload):
+        if radius <= 0:
+            return
+        self.entries[(lat, lon)] = (radius, payload)
+        self.entries.move_to_end((lat, lon))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -2,33 +2,221 @@
 
 const API_BASE_URL = "http://127.0.0.1:8000";
 
-async function analyzeLocation(lat, lon) {
-    try {
-        const response = await fetch(`${API_BASE_URL}/analyze-location`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ latitude: lat, longitude: lon }),
+// --- Result Cache ---
+// Streams are cached per quantized coordinate and dataset version: in memory for this
+// session and in IndexedDB across sessions. Identical in-flight requests are shared,
+// and a newer UI request aborts the one it supersedes.
+
+const COORD_PRECISION = 5; // ~1 m
+const MEMORY_CACHE_SIZE = 200;
+const VALIDITY_CACHE_SIZE = 50;
+const RESULT_DB_NAME = 'smartland';
+const RESULT_STORE = 'results';
+const MAX_STORED_RESULTS = 500;
+const SAVED_LOCATIONS_KEY = 'smartland.savedLocations';
+
+const memoryCache = new Map();   // key -> sections (insertion order = LRU order)
+const validityCache = [];        // results reused for any point inside their validity radius
+const inFlight = new Map();      // key -> shared streaming request
+let foregroundRequest = null;    // latest UI request, aborted when superseded
+let datasetVersionPromise = null;
+let resultDbPromise = null;
+
+function quantize(value) {
+    return Number(value.toFixed(COORD_PRECISION));
+}
+
+function haversineMeters(lat1, lon1, lat2, lon2) {
+    const toRad = (deg) => deg * Math.PI / 180;
+    const dLat = toRad(lat2 - lat1);
+    const dLon = toRad(lon2 - lon1);
+    const a = Math.sin(dLat / 2) ** 2 +
+        Math.cos(toRad(lat1)) * Math.cos(toRad(lat2)) * Math.sin(dLon / 2) ** 2;
+    return 2 * 6371008.8 * Math.asin(Math.sqrt(a));
+}
+
+function findValidResult(lat, lon) {
+    for (const entry of validityCache) {
+        const moved = haversineMeters(lat, lon, entry.lat, entry.lon);
+        if (moved <= entry.radius) {
+            return { sections: entry.sections, radius: Math.floor(entry.radius - moved) };
+        }
+    }
+    return null;
+}
+
+function storeValidResult(key, lat, lon, sections) {
+    const validity = sections.find(s => s.section === 'validity');
+    if (!validity || validity.data.validity_radius_m <= 0) return;
+
+    // Repeat hits move the entry to the front instead of duplicating it
+    const existing = validityCache.findIndex(entry => entry.key === key);
+    if (existing !== -1) validityCache.splice(existing, 1);
+
+    validityCache.unshift({ key, lat, lon, radius: validity.data.validity_radius_m, sections });
+    if (validityCache.length > VALIDITY_CACHE_SIZE) validityCache.pop();
+}
+
+function rememberResult(key, lat, lon, sections) {
+    memoryCache.delete(key);
+    memoryCache.set(key, sections);
+    if (memoryCache.size > MEMORY_CACHE_SIZE) {
+        memoryCache.delete(memoryCache.keys().next().value);
+    }
+    storeValidResult(key, lat, lon, sections);
+}
+
+// A stream is cacheable only if nothing failed and it has a validity radius. Its terminal section
+// must be the assessment or an out-of-area result; other error sections are transient server failures.
+function isCompleteStream(sections) {
+    if (sections.some(s => s.error !== undefined)) return false;
+    if (!sections.some(s => s.section === 'validity')) return false;
+
+    const terminal = sections.find(s => s.section === 'overall_assessment' || s.section === 'error');
+    if (!terminal) return false;
+    return terminal.section === 'overall_assessment' || terminal.data.status === 'out_of_service_area';
+}
+
+function replaySections(sections, onSection, lat, lon, radius) {
+    sections.forEach(({ section, data, error }) => {
+        if (section === 'location') data = { ...data, latitude: lat, longitude: lon };
+        if (section === 'validity' && radius !== undefined) data = { validity_radius_m: radius };
+        onSection(section, data, error);
+    });
+}
+
+function getDatasetVersion() {
+    if (!datasetVersionPromise) {
+        datasetVersionPromise = fetch(`${API_BASE_URL}/dataset-version`)
+            .then(response => response.json())
+            .then(data => {
+                pruneStaleResults(data.version);
+                return data.version;
+            })
+            .catch(error => {
+                console.error("Dataset version unavailable:", error);
+                datasetVersionPromise = null; // Retry on the next request
+                return null;
+            });
+    }
+    return datasetVersionPromise;
+}
+
+// --- IndexedDB persistence ---
+
+function openResultDb() {
+    if (!resultDbPromise) {
+        resultDbPromise = new Promise((resolve) => {
+            if (!window.indexedDB) {
+                resolve(null);
+                return;
+            }
+            const request = indexedDB.open(RESULT_DB_NAME, 1);
+            request.onupgradeneeded = () => {
+                const store = request.result.createObjectStore(RESULT_STORE, { keyPath: 'key' });
+                store.createIndex('savedAt', 'savedAt');
+            };
+            request.onsuccess = () => resolve(request.result);
+            request.onerror = () => resolve(null); // e.g. private browsing: memory cache only
         });
+    }
+    return resultDbPromise;
+}
+
+async function readStoredResult(key) {
+    const db = await openResultDb();
+    if (!db) return null;
+
+    return new Promise((resolve) => {
+        const request = db.transaction(RESULT_STORE).objectStore(RESULT_STORE).get(key);
+        request.onsuccess = () => resolve(request.result || null);
+        request.onerror = () => resolve(null);
+    });
+}
+
+async function writeStoredResult(record) {
+    const db = await openResultDb();
+    if (!db) return;
 
-        const data = await response.json();
+    const store = db.transaction(RESULT_STORE, 'readwrite').objectStore(RESULT_STORE);
+    store.put(record);
+
+    // Keep the store bounded: evict the oldest records beyond the cap
+    const count = store.count();
+    count.onsuccess = () => {
+        let excess = count.result - MAX_STORED_RESULTS;
+        if (excess <= 0) return;
+
+        const cursorRequest = store.index('savedAt').openCursor();
+        cursorRequest.onsuccess = () => {
+            const cursor = cursorRequest.result;
+            if (!cursor || excess <= 0) return;
+            cursor.delete();
+            excess -= 1;
+            cursor.continue();
+        };
+    };
+}
+
+async function pruneStaleResults(version) {
+    const db = await openResultDb();
+    if (!db) return;
+
+    // Results computed against an older dataset can never be hit again
+    const request = db.transaction(RESULT_STORE, 'readwrite').objectStore(RESULT_STORE).openCursor();
+    request.onsuccess = () => {
+        const cursor = request.result;
+        if (!cursor) return;
+        if (cursor.value.version !== version) cursor.delete();
+        cursor.continue();
+    };
+}
+
+// Streams analysis sections (NDJSON) into request.sections, notifying every listener
+async function fetchStream(request) {
+    try {
+        const response = await fetch(
+            `${API_BASE_URL}/analyze-location/stream?lat=${request.lat}&lon=${request.lon}`,
+            { signal: request.controller.signal }
+        );
 
         if (!response.ok) {
-            // Handle expected errors (400)
+            const data = await response.json();
             return {
                 success: false,
-                error: data
+                error: { message: data.detail || "Analysis request failed." }
             };
         }
 
-        return {
-            success: true,
-            data: data
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        const emitLine = (line) => {
+            if (!line.trim()) return;
+            const message = JSON.parse(line);
+            request.sections.push(message);
+            request.listeners.forEach(listener => listener(message.section, message.data, message.error));
         };
 
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop(); // Keep the incomplete trailing line
+            lines.forEach(emitLine);
+        }
+        emitLine(buffer + decoder.decode());
+
+        return { success: true };
+
     } catch (error) {
-        console.error("API Error:", error);
+        if (error.name === 'AbortError') {
+            return { success: false, aborted: true };
+        }
+        console.error("Stream API Error:", error);
         return {
             success: false,
             error: { message: "Failed to connect to analysis server." }
@@ -36,24 +224,145 @@ async function analyzeLocation(lat, lon) {
     }
 }
 
-async function fetchInfrastructureContext(lat, lon) {
-    try {
-        const response = await fetch(`${API_BASE_URL}/infrastructure-context?lat=${lat}&lon=${lon}`);
-        const data = await response.json();
+function startStream(key, lat, lon, version, background) {
+    const request = {
+        key, lat, lon, background,
+        controller: new AbortController(),
+        sections: [],
+        listeners: new Set()
+    };
 
-        if (!response.ok) {
-            return {
-                success: false,
-                data: null
-            };
+    request.done = fetchStream(request).then(result => {
+        if (inFlight.get(key) === request) inFlight.delete(key);
+
+        if (result.success && version && isCompleteStream(request.sections)) {
+            rememberResult(key, lat, lon, request.sections);
+            writeStoredResult({ key, version, lat, lon, sections: request.sections, savedAt: Date.now() });
         }
+        return result;
+    });
 
-        return {
-            success: true,
-            data: data
-        };
+    inFlight.set(key, request);
+    return request;
+}
+
+function supersedeForeground(lat, lon) {
+    if (!foregroundRequest) return;
+
+    const { request, listener, cancel } = foregroundRequest;
+    foregroundRequest = null;
+    cancel();
+    if (!request) return; // Still resolving from cache
+
+    request.listeners.delete(listener);
+
+    // Abort the network request unless someone else still needs it
+    const sameLocation = request.lat === lat && request.lon === lon;
+    if (!sameLocation && !request.background && request.listeners.size === 0) {
+        if (inFlight.get(request.key) === request) inFlight.delete(request.key);
+        request.controller.abort();
+    }
+}
+
+// Hands each analysis section to onSection(section, data, error) as soon as it is available,
+// from cache or from the streaming endpoint.
+// Background requests (preloads) never supersede or get superseded by UI requests.
+async function streamAnalysis(lat, lon, onSection, { background = false } = {}) {
+    lat = quantize(lat);
+    lon = quantize(lon);
+
+    let cancel = () => {};
+    const cancelled = new Promise(resolve => {
+        cancel = () => resolve({ success: false, aborted: true });
+    });
+    const token = { request: null, listener: onSection, cancel };
+    if (!background) {
+        supersedeForeground(lat, lon);
+        foregroundRequest = token;
+    }
+    const isStale = () => !background && foregroundRequest !== token;
+
+    const version = await getDatasetVersion();
+    if (isStale()) return { success: false, aborted: true };
+    const key = `${version}:${lat},${lon}`;
+
+    // 1. Session memory
+    if (version && memoryCache.has(key)) {
+        const sections = memoryCache.get(key);
+        rememberResult(key, lat, lon, sections);
+        replaySections(sections, onSection, lat, lon);
+        return { success: true };
+    }
+
+    // 2. Same result guaranteed inside a cached validity radius
+    const valid = findValidResult(lat, lon);
+    if (valid) {
+        replaySections(valid.sections, onSection, lat, lon, valid.radius);
+        return { success: true };
+    }
+
+    // 3. Previous sessions
+    if (version) {
+        const stored = await readStoredResult(key);
+        if (isStale()) return { success: false, aborted: true };
+        if (stored) {
+            rememberResult(key, lat, lon, stored.sections);
+            replaySections(stored.sections, onSection, lat, lon);
+            return { success: true };
+        }
+    }
+
+    // 4. Network, shared with an identical in-flight request
+    let request = inFlight.get(key);
+    if (request) {
+        replaySections(request.sections, onSection, lat, lon);
+    } else {
+        request = startStream(key, lat, lon, version, background);
+    }
+    request.listeners.add(onSection);
+    token.request = request;
+
+    const result = await Promise.race([request.done, cancelled]);
+    request.listeners.delete(onSection);
+    if (foregroundRequest === token) foregroundRequest = null;
+    return result;
+}
+
+// --- Saved Locations ---
+
+function getSavedLocations() {
+    try {
+        return JSON.parse(localStorage.getItem(SAVED_LOCATIONS_KEY)) || [];
     } catch (e) {
-        console.error("Infra API Error", e);
-        return { success: false, data: null };
+        return [];
     }
 }
+
+function saveLocation(lat, lon) {
+    lat = quantize(lat);
+    lon = quantize(lon);
+
+    const saved = getSavedLocations();
+    if (!saved.some(loc => loc.lat === lat && loc.lon === lon)) {
+        saved.push({ lat, lon });
+        localStorage.setItem(SAVED_LOCATIONS_KEY, JSON.stringify(saved));
+    }
+    return saved;
+}
+
+function removeSavedLocation(lat, lon) {
+    const saved = getSavedLocations().filter(loc => !(loc.lat === lat && loc.lon === lon));
+    localStorage.setItem(SAVED_LOCATIONS_KEY, JSON.stringify(saved));
+    return saved;
+}
+
+// Warms the cache for saved locations one at a time when the browser is idle
+function preloadSavedLocations() {
+    const schedule = window.requestIdleCallback || ((cb) => setTimeout(cb, 1000));
+    schedule(() => {
+        getSavedLocations().reduce(
+            (chain, loc) => chain.then(() => streamAnalysis(loc.lat, loc.lon, () => {}, { background: true })),
+            Promise.resolve()
+        );
+    });
+}
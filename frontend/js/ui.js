@@ -18,6 +18,13 @@ document.addEventListener('DOMContentLoaded', () => {
     const infraContainer = document.getElementById('infra-container');
     const warningBannerContainer = document.getElementById('warning-banner-container');
     const constraintReasons = document.getElementById('constraint-reasons');
+    const renderedSources = new Set();
+    const saveBtn = document.getElementById('save-btn');
+    const savedLocationsContainer = document.getElementById('saved-locations');
+    let lastAnalyzed = null;
+
+    renderSavedLocations();
+    preloadSavedLocations();
 
     analyzeBtn.addEventListener('click', async () => {
         console.log("Analyze button clicked");
@@ -56,30 +63,104 @@ document.addEventListener('DOMContentLoaded', () => {
 
         // Reset UI
         clearResults();
+        saveBtn.classList.add('hidden');
         showLoading(true);
         updateMapMarker(lat, lon); // Update map immediately on click
 
-        // Call API
-        const result = await analyzeLocation(lat, lon);
+        // Stream API - each section renders as soon as the backend finishes it
+        let firstSection = true;
+        let serviceAreaError = null;
+        let complete = false;
+        const result = await streamAnalysis(lat, lon, (section, data, error) => {
+            if (firstSection) {
+                showLoading(false);
+                firstSection = false;
+            }
 
-        showLoading(false);
+            // The stream is only finished once a terminal section has arrived
+            if (section === 'overall_assessment' || section === 'error') {
+                complete = true;
+            }
 
-        if (result.success) {
-            renderResults(result.data);
+            if (error) {
+                renderSectionError(section);
+                return;
+            }
 
-            // --- Fetch Infrastructure Context ---
-            const infraResult = await fetchInfrastructureContext(lat, lon);
-            if (infraResult.success) {
-                renderInfrastructure(infraResult.data);
-                if (infraResult.data.overall_assessment) {
-                    renderWarningBanner(infraResult.data.overall_assessment);
-                }
+            switch (section) {
+                case 'error':
+                    serviceAreaError = data.message;
+                    break;
+                case 'location':
+                    renderLocation(data);
+                    break;
+                case 'infrastructure':
+                    renderInfrastructure(data);
+                    break;
+                case 'overall_assessment':
+                    renderWarningBanner(data);
+                    break;
+                case 'validity':
+                    // Consumed by the API layer cache
+                    break;
+                default:
+                    // flood, pollution, groundwater, seismic, coastal, climate
+                    renderRiskSection(data);
             }
-        } else {
+        });
+
+        // Superseded by a newer click, which now owns the UI
+        if (result.aborted) return;
+
+        showLoading(false);
+
+        if (!result.success) {
             showError(result.error.message);
+        } else if (serviceAreaError) {
+            showError(serviceAreaError);
+        } else if (!complete) {
+            showError("Analysis was interrupted. Please try again.");
+        } else {
+            finalizeSources();
+            lastAnalyzed = { lat, lon };
+            saveBtn.classList.remove('hidden');
         }
     });
 
+    saveBtn.addEventListener('click', () => {
+        if (!lastAnalyzed) return;
+        saveLocation(lastAnalyzed.lat, lastAnalyzed.lon);
+        renderSavedLocations();
+    });
+
+    function renderSavedLocations() {
+        savedLocationsContainer.innerHTML = '';
+
+        getSavedLocations().forEach(loc => {
+            const chip = document.createElement('div');
+            chip.className = 'saved-chip';
+            chip.textContent = `${loc.lat.toFixed(4)}, ${loc.lon.toFixed(4)}`;
+
+            const remove = document.createElement('span');
+            remove.className = 'saved-chip-remove';
+            remove.textContent = '×';
+            remove.addEventListener('click', (e) => {
+                e.stopPropagation();
+                removeSavedLocation(loc.lat, loc.lon);
+                renderSavedLocations();
+            });
+            chip.appendChild(remove);
+
+            // Saved results are preloaded, so this usually renders straight from cache
+            chip.addEventListener('click', () => {
+                coordinateInput.value = `${loc.lat}, ${loc.lon}`;
+                analyzeBtn.click();
+            });
+
+            savedLocationsContainer.appendChild(chip);
+        });
+    }
+
     function showLoading(isLoading) {
         if (isLoading) {
             statusCard.classList.remove('hidden');
@@ -109,6 +190,7 @@ document.addEventListener('DOMContentLoaded', () => {
         riskTagsContainer.innerHTML = '';
         explanationsContainer.innerHTML = '';
         sourcesList.innerHTML = '';
+        renderedSources.clear();
         wardDisplay.textContent = '-';
 
         infrastructureSection.classList.add('hidden');
@@ -117,12 +199,13 @@ document.addEventListener('DOMContentLoaded', () => {
         constraintReasons.innerHTML = '';
     }
 
-    function renderResults(data) {
-        // 1. Summary
+    function renderLocation(location) {
         summarySection.classList.remove('hidden');
-        wardDisplay.textContent = data.location.ward || "Unknown Ward";
+        wardDisplay.textContent = location.ward || "Unknown Ward";
+    }
 
-        // Tags
+    function renderRiskSection(data) {
+        // 1. Tags
         data.risk_tags.forEach(tag => {
             const el = document.createElement('div');
             // Determine class based on risk_level
@@ -137,7 +220,9 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
         // 2. Explanations
-        detailsSection.classList.remove('hidden');
+        if (data.explanations.length > 0) {
+            detailsSection.classList.remove('hidden');
+        }
         data.explanations.forEach(expl => {
             const card = document.createElement('div');
             card.className = 'detail-card';
@@ -172,17 +257,40 @@ document.addEventListener('DOMContentLoaded', () => {
             card.appendChild(header);
             card.appendChild(body);
             explanationsContainer.appendChild(card);
-        });
 
-        // 3. Data Sources
-        if (data.data_sources && data.data_sources.length > 0) {
-            data.data_sources.forEach(source => {
+            // 3. Data Sources (deduplicated as sections arrive)
+            if (!renderedSources.has(expl.source)) {
+                renderedSources.add(expl.source);
                 const li = document.createElement('li');
                 li.style.marginBottom = '4px';
-                li.innerHTML = `• ${source}`;
+                li.innerHTML = `• ${expl.source}`;
                 sourcesList.appendChild(li);
-            });
-        } else {
+            }
+        });
+    }
+
+    // A single failed check is shown in place; the rest of the analysis still renders
+    function renderSectionError(section) {
+        const labels = {
+            flood: 'Flood',
+            pollution: 'Industrial',
+            groundwater: 'Groundwater',
+            seismic: 'Seismic',
+            coastal: 'Coastal',
+            climate: 'Climate',
+            infrastructure: 'Infrastructure'
+        };
+        if (!labels[section]) return; // validity / assessment failures have no card
+
+        summarySection.classList.remove('hidden');
+        const el = document.createElement('div');
+        el.className = 'risk-pill unavailable';
+        el.textContent = `${labels[section]}: UNAVAILABLE`;
+        riskTagsContainer.appendChild(el);
+    }
+
+    function finalizeSources() {
+        if (renderedSources.size === 0 && !summarySection.classList.contains('hidden')) {
             const li = document.createElement('li');
             li.textContent = "No specific sources cited.";
             sourcesList.appendChild(li);